@@ -11,8 +11,8 @@ http://stackoverflow.com/questions/1904351/python-observer-pattern-examples-tips
 
 '''
 
+import contextlib
 import functools
-import inspect
 
 try:
     # use python3 signatures if available
@@ -24,6 +24,12 @@ except ImportError: # pragma: no cover
     def signature(fn):
         return None
 
+try:
+    from sys import intern
+except ImportError: # pragma: no cover
+    # python2 has intern as a builtin
+    pass
+
 __all__ = ['event']
 __version__ = '0.2'
 
@@ -105,6 +111,17 @@ class event(object):
     >>> c=gc.collect()
     >>> assert wr() is None
 
+    Producers that emit an event many times in a row can defer the handlers
+    until the end of a batch:
+
+    >>> with b.progress.batch() as progress:
+    ...     progress("Hi", "1")
+    ...     progress("Hi", "2")
+    Doing something...
+    Doing something...
+    Hi Bar and 1!
+    Hi Bar and 2!
+
     '''
 
     def __init__(self, function):
@@ -116,10 +133,63 @@ class event(object):
         '''
         # Copy docstring and other attributes from function
         functools.update_wrapper(self, function)
-        self.__signature__ = signature(function)
-        # Used to enforce call signature even when no slot is connected.
-        # Can also execute code (called before handlers)
+        # Kept explicitly, since update_wrapper sets no __wrapped__ on
+        # python2
         self.__function = function
+        self.__signature = None
+        # The bound events of this event share a class that carries the
+        # name, docstring and module of the decorated function.  This way
+        # they need not be copied onto every single bound event on attribute
+        # access.  Their signature is found by inspect.signature via
+        # __wrapped__.  Other function attributes are looked up on the
+        # function itself, see boundevent.__getattr__.
+        method = staticmethod(function)
+        self.__bound_type = type('boundevent', (boundevent,), dict(
+            __module__=function.__module__,
+            __name__=function.__name__,
+            __doc__=function.__doc__,
+            __wrapped__=method,
+            __func__=method,
+            # Used to enforce call signature even when no slot is connected.
+            # Can also execute code (called before handlers)
+            _function=method,
+            __slots__=(),
+            # Keys of the handler list and batch buffer in the instance
+            # namespace.  They are interned, since every emission uses them.
+            _key=intern(' ' + function.__name__),
+            _batch_key=intern(' batch ' + function.__name__)))
+        # Built on first access via the owner class, see __get__
+        self.__unbound = None
+
+    @property
+    def __signature__(self):
+        '''
+        Signature of the decorated function.
+
+        It is only computed when first asked for, since few events are ever
+        introspected.
+
+        '''
+        if self.__signature is None:
+            self.__signature = signature(self.__function)
+        return self.__signature
+
+    def __make_unbound(self):
+        '''
+        Create the plain function returned for access via the owner class.
+
+        It always is the same function, so it is built (and the attributes
+        of the decorated function copied onto it) only once.  This is
+        deferred until it is needed, since many events are only ever used
+        through instances.
+
+        '''
+        function = self.__function
+        bound_type = self.__bound_type
+        @functools.wraps(function)
+        def unbound(instance, *args, **kwargs):
+            return bound_type(instance)(*args, **kwargs)
+        return unbound
 
     def __set__(self, instance, value):
         '''
@@ -147,19 +217,22 @@ class event(object):
         '''
         # this case corresponds to access via the owner class:
         if instance is None:
-            @functools.wraps(self.__function)
-            def wrapper(instance, *args, **kwargs):
-                return self.__get__(instance, owner)(*args, **kwargs)
-        else:
-            wrapper = functools.wraps(self.__function)(boundevent(instance, self.__function))
-        wrapper.__signature__ = self.__signature__
-        return wrapper
+            if self.__unbound is None:
+                self.__unbound = self.__make_unbound()
+            return self.__unbound
+        return self.__bound_type(instance)
 
 
 class boundevent(object):
     '''Private helper class for event system.'''
 
-    def __init__(self, instance, function):
+    # A bound event is created on every attribute access, so keep it small.
+    # The `_function`, `_key` and `_batch_key` attributes are provided by the
+    # subclass that is created for every event.  Bound events can still be
+    # weakly referenced, like bound methods.
+    __slots__ = ('instance', '_storage', '__weakref__')
+
+    def __init__(self, instance):
         '''
         Constructor.
 
@@ -167,14 +240,51 @@ class boundevent(object):
 
         '''
         self.instance = instance
-        self.__function = function
-        self.__key = ' ' + function.__name__
+        # The handlers live in the instance namespace.  Hold on to it
+        # directly rather than going through the instance on every access.
+        # They are stored as a tuple that is replaced on every change, so
+        # an emission can iterate over it without copying.
+        self._storage = instance.__dict__
+
+    def __getattr__(self, name):
+        '''
+        Look up the attributes of the decorated function.
+
+        They are not copied, so they are returned as they are (functions
+        stay unbound) and those set after decoration are found as well.
+        Attributes of the bound event itself take precedence.
+
+        '''
+        try:
+            return type(self)._function.__dict__[name]
+        except KeyError:
+            raise AttributeError(name)
 
     @property
-    def __event_handlers(self):
-        if self.__key not in self.instance.__dict__:
-            self.instance.__dict__[self.__key] = []
-        return self.instance.__dict__[self.__key]
+    def __self__(self):
+        '''The instance, like on bound methods.'''
+        return self.instance
+
+    def __repr__(self):
+        return '<bound event %s of %r>' % (self.__name__, self.instance)
+
+    def __reduce__(self):
+        '''Bound events are pickled by name, like bound methods.'''
+        return getattr, (self.instance, self.__name__)
+
+    def __eq__(self, other):
+        '''
+        Bound events are equal if they bind the same event to the same
+        instance, just like bound methods.
+
+        '''
+        return type(other) is type(self) and other.instance is self.instance
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((type(self), id(self.instance)))
 
     def __iadd__(self, function):
         '''
@@ -185,7 +295,8 @@ class boundevent(object):
 
         '''
         # Add the function as a new event handler
-        self.__event_handlers.append(function)
+        storage = self._storage
+        storage[self._key] = storage.get(self._key, ()) + (function,)
         # Return the boundevent instance itself for coherent syntax behaviour
         return self
 
@@ -198,11 +309,54 @@ class boundevent(object):
             function that needs to be removed from the list of event handlers.
 
         '''
-        # Remove the function from the list of registered event handlers
-        self.__event_handlers.remove(function)
+        # Remove the function from the registered event handlers
+        storage = self._storage
+        handlers = list(storage.get(self._key, ()))
+        handlers.remove(function)
+        # Without handlers the event is back on its fast path, which does not
+        # need the tuple at all
+        if handlers:
+            storage[self._key] = tuple(handlers)
+        else:
+            del storage[self._key]
         # Return the boundevent instance itself for coherent syntax behaviour
         return self
 
+    @contextlib.contextmanager
+    def batch(self):
+        '''
+        Context manager that defers the event handlers until it is left.
+
+        The decorated function still runs on every call.  The handlers
+        connected on exit are then invoked for every deferred emission in
+        turn.  A handler with a true `batched` attribute is instead invoked
+        only once, as `handler(instance, calls)` with a list of the
+        `(args, kwargs)` of all deferred emissions.  Outside of a batch, it
+        is invoked like any other handler.  Emissions without any
+        connected handler are not recorded.  Nested batches are flushed
+        only by the outermost one.  If the batch is left by an exception,
+        the deferred emissions are discarded.
+
+        '''
+        storage = self._storage
+        calls = []
+        if storage.setdefault(self._batch_key, calls) is not calls:
+            # an outer batch is active and takes care of the handlers
+            yield self
+            return
+        try:
+            yield self
+        finally:
+            del storage[self._batch_key]
+        if calls:
+            instance = self.instance
+            for f in storage.get(self._key, ()):
+                if getattr(f, 'batched', False):
+                    f(instance, calls)
+                else:
+                    for args, kwargs in calls:
+                        f(instance, *args, **kwargs)
+
     def __call__(self, *args, **kwargs):
         '''
         Overloaded call method; it defines the behaviour of boundevent().
@@ -215,8 +369,24 @@ class boundevent(object):
         # Enforce signature and possibly execute entry code. This makes sure
         # any inconsistent call will be caught immediately, independent of
         # connected handlers.
-        result = self.__function(self.instance, *args, **kwargs)
-        # Call all registered event handlers
-        for f in self.__event_handlers[:]:
-            f(self.instance, *args, **kwargs)
+        instance = self.instance
+        result = self._function(instance, *args, **kwargs)
+        # Call all registered event handlers.  The loop only touches locals,
+        # since it runs on every single emission.  Handlers that (dis)connect
+        # while the event is handled replace the tuple, rather than modify
+        # the one being iterated.
+        storage = self._storage
+        handlers = storage.get(self._key)
+        if handlers:
+            calls = storage.get(self._batch_key)
+            if calls is not None:
+                calls.append((args, kwargs))
+                return result
+            # A single handler is the most common case, so call it without
+            # setting up a loop
+            if len(handlers) == 1:
+                handlers[0](instance, *args, **kwargs)
+            else:
+                for f in handlers:
+                    f(instance, *args, **kwargs)
         return result
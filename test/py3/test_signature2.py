@@ -23,13 +23,21 @@ def on_blubb(
 class A(object):
     on_blubb = event(on_blubb)
 
+expected_signature = signature(on_blubb)
+
 
 def test_signature():
     # Define a test class and an event handler
     a = A()
 
     # signature is preserved: (!!)
-    assert signature(a.on_blubb) == signature(on_blubb)
+    assert signature(a.on_blubb) == expected_signature
+    assert signature(A.on_blubb) == expected_signature
+
+    # the event descriptor computes its signature only once:
+    descriptor = A.__dict__['on_blubb']
+    assert descriptor.__signature__ == expected_signature
+    assert descriptor.__signature__ is descriptor.__signature__
 
     # NOTE: we even got the exact object as default parameter, not only an
     # exact copy:
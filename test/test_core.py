@@ -6,6 +6,7 @@ Contains a converted version of all of the doctests.
 """
 # test utilities
 import unittest
+import pickle
 import weakref, gc
 
 # tested module
@@ -17,6 +18,7 @@ class NewStyle(object):
         self.count = 0
     @event
     def emit(self, first, second):
+        '''Emit the event.'''
         self.count += 1
 
 class OldStyle:
@@ -26,6 +28,10 @@ class OldStyle:
     def emit(self, first, second):
         self.count += 1
 
+pickled_calls = []
+def pickled_handler(source, first, second):
+    pickled_calls.append((source, first, second))
+
 class Observer(object):
     def __init__(self, call_stack):
         self.call_stack = call_stack
@@ -57,6 +63,21 @@ class TestCore(unittest.TestCase):
         src.emit("Hello", "World")
         self.check_stack([(obs, 0, src, "Hello", "World")])
 
+    def test_no_handlers(self):
+        """Emitting an event without handlers leaves the instance alone."""
+        src = self.cls()
+        src.emit("Hello", "World")
+        self.assertEqual(vars(src), {'count': 1})
+
+    def test_unpickled_handlers(self):
+        """Handlers restored by unpickling an instance are invoked."""
+        src = self.cls()
+        src.emit += pickled_handler
+        copy = pickle.loads(pickle.dumps(src))
+        del pickled_calls[:]
+        copy.emit("Hello", "World")
+        self.assertEqual(pickled_calls, [(copy, "Hello", "World")])
+
     def test_remove_handler(self):
         """Removal of event handlers works correctly."""
         src = self.cls()
@@ -64,6 +85,67 @@ class TestCore(unittest.TestCase):
         src.emit -= obs
         src.emit("something", "arbitrary")
         self.check_stack([])
+        # no empty handler list is left behind (classic instances ignore
+        # event.__set__ and store the bound event, so only check the key):
+        self.assertNotIn(' emit', vars(src))
+
+    def test_remove_equal_handler(self):
+        """Handlers are removed by equality, e.g. fresh bound methods."""
+        src = self.cls()
+        obs = Observer(self.call_stack)
+        src.emit += obs.__call__
+        src.emit -= obs.__call__
+        src.emit("something", "arbitrary")
+        self.check_stack([])
+
+    def test_duplicate_handler(self):
+        """A handler connected twice is invoked twice until removed."""
+        src = self.cls()
+        obs = self.observer(src)
+        src.emit += obs
+        src.emit("Hello", "World")
+        self.check_stack([(obs, 0, src, "Hello", "World"),
+                          (obs, 1, src, "Hello", "World")])
+        src.emit -= obs
+        src.emit("Hi", "!")
+        self.check_stack([(obs, 0, src, "Hello", "World"),
+                          (obs, 1, src, "Hello", "World"),
+                          (obs, 1, src, "Hi", "!")])
+
+    def test_remove_unknown_handler(self):
+        """Removing a handler that is not connected raises a ValueError."""
+        src = self.cls()
+        obs = Observer(self.call_stack)
+        with self.assertRaises(ValueError):
+            src.emit -= obs
+        self.assertEqual(vars(src), {'count': 0})
+
+    def test_modify_during_emission(self):
+        """Handlers (dis)connected by a handler apply to the next emission."""
+        src = self.cls()
+        first = Observer(self.call_stack)
+        later = Observer(self.call_stack)
+        def modify(source, first_arg, second_arg):
+            source.emit -= modify
+            source.emit -= later
+            source.emit += first
+        src.emit += modify
+        src.emit += later
+        src.emit("Hello", "World")
+        self.check_stack([(later, 0, src, "Hello", "World")])
+        src.emit("Hi", "!")
+        self.assertEqual(self.call_stack[1:], [(first, 0, src, "Hi", "!")])
+
+    def test_handler_exception(self):
+        """Exceptions in handlers propagate and skip later handlers."""
+        src = self.cls()
+        def fail(source, first, second):
+            raise RuntimeError(first)
+        src.emit += fail
+        obs = self.observer(src)
+        self.assertRaises(RuntimeError, src.emit, "Hello", "World")
+        self.assertEqual(src.count, 1)
+        self.check_stack([])
 
     def test_multiple_handlers(self):
         """Multiple handlers are invoked in correct order."""
@@ -89,6 +171,18 @@ class TestCore(unittest.TestCase):
         src.emit(second="World", first="Hello")
         self.check_stack([(obs, 0, src, "Hello", "World")])
 
+    def test_arguments_forwarded_as_given(self):
+        """Handlers receive the arguments exactly as the event was called."""
+        src = self.cls()
+        calls = []
+        def handler(source, *args, **kwargs):
+            calls.append((args, kwargs))
+        src.emit += handler
+        src.emit("Hello", second="World")
+        src.emit(second="World", first="Hello")
+        self.assertEqual(calls, [(("Hello",), {'second': "World"}),
+                                 ((), {'first': "Hello", 'second': "World"})])
+
     def test_wrong_signature(self):
         """Any incorrect call signature raises a TypeError."""
         src = self.cls()
@@ -105,6 +199,109 @@ class TestCore(unittest.TestCase):
         obs = self.observer(src)
         self.cls.emit(src, "Hello", "World")
         self.check_stack([(obs, 0, src, "Hello", "World")])
+        self.assertIs(self.cls.emit, self.cls.emit)
+        self.assertEqual(self.cls.emit.__name__, "emit")
+
+    def test_metadata(self):
+        """Bound events carry the attributes of the decorated function."""
+        src = self.cls()
+        self.assertEqual(src.emit.__name__, "emit")
+        self.assertEqual(src.emit.__doc__, self.cls.emit.__doc__)
+        self.assertEqual(src.emit.__module__, __name__)
+        self.assertIs(type(src.emit), type(self.cls().emit))
+        self.assertIs(src.emit.__self__, src)
+        self.assertIs(src.emit.__func__, type(src.emit)._function)
+        # __func__ is the decorated function, which invokes no handlers:
+        obs = self.observer(src)
+        src.emit.__func__(src, "Hello", "World")
+        self.assertEqual(src.count, 1)
+        self.check_stack([])
+        # nothing is copied onto the bound event itself on access:
+        self.assertFalse(hasattr(src.emit, '__dict__'))
+        # but bound events can be weakly referenced, like bound methods:
+        emit = src.emit
+        self.assertIs(weakref.ref(emit)(), emit)
+
+    def test_function_attributes(self):
+        """Bound events look up function attributes on the function."""
+        def helper():
+            pass
+        def function(self):
+            pass
+        function.marker = 1
+        function.helper = helper
+        function.instance = None
+        class Source(self.cls):
+            emit = event(function)
+        function.late = 2
+        src = Source()
+        self.assertEqual(src.emit.marker, 1)
+        self.assertIs(src.emit.helper, helper)
+        self.assertEqual(src.emit.late, 2)
+        self.assertRaises(AttributeError, getattr, src.emit, 'missing')
+        # they do not shadow the bound event machinery:
+        self.assertIs(src.emit.instance, src)
+        calls = []
+        src.emit += lambda source: calls.append(source)
+        src.emit()
+        self.assertEqual(calls, [src])
+
+    def test_pickled_bound_event(self):
+        """Bound events are pickled by name, like bound methods."""
+        src = self.cls()
+        self.assertTrue(repr(src.emit).startswith("<bound event emit of "))
+        emit = pickle.loads(pickle.dumps(src.emit))
+        self.assertIs(type(emit), type(src.emit))
+        emit("Hello", "World")
+        self.assertEqual(emit.__self__.count, 1)
+
+    def test_batch(self):
+        """Handlers are deferred until the end of a batch."""
+        src = self.cls()
+        obs = self.observer(src)
+        calls = []
+        def batched(source, *args, **kwargs):
+            calls.append((source, args, kwargs))
+        batched.batched = True
+        src.emit += batched
+        with src.emit.batch():
+            src.emit("Hello", "World")
+            with src.emit.batch():
+                src.emit(second="!", first="Hi")
+            self.check_stack([])
+        self.assertEqual(src.count, 2)
+        self.check_stack([(obs, -1, src, "Hello", "World"),
+                          (obs, 0, src, "Hi", "!")])
+        self.assertEqual(calls, [(src, ([(("Hello", "World"), {}),
+                                         ((), {'second': "!", 'first': "Hi"})],),
+                                  {})])
+        # outside of a batch, batched handlers are invoked as usual:
+        src.emit("Hello", "again")
+        self.assertEqual(calls[1], (src, ("Hello", "again"), {}))
+
+    def test_equality(self):
+        """Bound events compare equal if they bind the same instance."""
+        src, other = self.cls(), self.cls()
+        self.assertEqual(src.emit, src.emit)
+        self.assertEqual(hash(src.emit), hash(src.emit))
+        self.assertNotEqual(src.emit, other.emit)
+        self.assertNotEqual(src.emit, self.cls.emit)
+        self.assertEqual(len(set([src.emit, src.emit, other.emit])), 2)
+
+    def test_batch_exception(self):
+        """Deferred emissions are discarded if a batch raises."""
+        src = self.cls()
+        obs = self.observer(src)
+        def fail():
+            with src.emit.batch():
+                src.emit("Hello", "World")
+                raise KeyError("body")
+        self.assertRaises(KeyError, fail)
+        self.assertEqual(src.count, 1)
+        self.check_stack([])
+        # the batch is over, so emissions are dispatched immediately again:
+        src.emit("Hi", "!")
+        self.check_stack([(obs, -1, src, "Hi", "!")])
 
     def test_keep_alive(self):
         """A reference to a bound event method keeps its owner instance alive."""
@@ -6,7 +6,7 @@ is only possible for python3.
 import sys
 
 try:
-    from test.py3.test_signature import *
+    from test.py3.test_signature2 import *
 except ImportError:
     __test__ = False
 
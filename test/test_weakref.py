@@ -7,10 +7,37 @@ might prevent garbage collection.
 
 import weakref
 import gc
+import platform
 
 from obsub import event
 
 
+def collect():
+    '''
+    Make sure that unreachable objects have been freed.
+
+    CPython frees objects without reference cycles as soon as the last
+    reference is gone, so nothing needs to be done there.  Running the cyclic
+    garbage collector would hide the cycles these tests are looking for.
+    Other implementations (e.g. pypy) need an explicit collection.
+
+    '''
+    if platform.python_implementation() != 'CPython':
+        gc.collect()
+
+
+def setup_module():
+    # Objects that exist before the tests run are not what they are about.
+    # Freezing them keeps the collections in these tests from scanning them.
+    if hasattr(gc, 'freeze'):
+        gc.freeze()
+
+
+def teardown_module():
+    if hasattr(gc, 'unfreeze'):
+        gc.unfreeze()
+
+
 def test_memory_leak():
 
     # Define a test class and an event handler
@@ -26,8 +53,9 @@ def test_memory_leak():
     a = A()
     a.on_blubb += handler
 
-    # Weak reference for testing
-    wr = weakref.ref(a)
+    # Weak reference for testing; its callback fires when `a` is freed
+    freed = []
+    wr = weakref.ref(a, freed.append)
 
     # At first, weak reference exists
     assert wr() is not None
@@ -37,11 +65,9 @@ def test_memory_leak():
     # that there are very subtle ways to delete an instance:
     a = None
 
-    # Trigger the garbage collection manually
-    gc.collect()
-
     # after deletion it should be dead
-    assert wr() is None
+    collect()
+    assert freed == [wr]
 
 
 def test_object_stays_alive_during_handler_execution():
@@ -76,11 +102,10 @@ def test_object_stays_alive_during_handler_execution():
     b = B(A())
     b.a.on_blubb += handler
 
-    wr = weakref.ref(b.a)
+    freed = []
+    wr = weakref.ref(b.a, freed.append)
     b.a.on_blubb()
 
-    # Trigger the garbage collection manually
-    gc.collect()
-
     # make sure, b.a has been deleted after event handling
-    assert wr() is None
+    collect()
+    assert freed == [wr]